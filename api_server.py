@@ -5,20 +5,26 @@ Handles real-time video stream analysis from Chrome extension
 
 from fastapi import FastAPI, WebSocket, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
+from starlette.websockets import WebSocketState
 import cv2
 import numpy as np
-import base64
-import json
+import orjson
 import asyncio
 from typing import Dict, List
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime
 import uvicorn
-from collections import deque
+from collections import deque, OrderedDict
+from dataclasses import dataclass
 import torch
 import io
 from PIL import Image
+from turbojpeg import TurboJPEG, TJPF_BGR, TJFLAG_FASTDCT, TJFLAG_FASTUPSAMPLE
 
 from deepfake_detector import DeepfakeDetector
 
@@ -26,13 +32,56 @@ from deepfake_detector import DeepfakeDetector
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Uploads larger than this are rejected with 413; the request body limit
+# leaves room for multipart framing around the file
+MAX_UPLOAD = 8 * 1024 * 1024
+MAX_REQUEST_BODY = MAX_UPLOAD + 64 * 1024
+UPLOAD_CHUNK = 64 * 1024
+
+
+class RequestSizeLimitMiddleware:
+    """Reject HTTP requests whose Content-Length exceeds a limit, before the body is read"""
+    
+    def __init__(self, app, max_body: int):
+        self.app = app
+        self.max_body = max_body
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            for name, value in scope['headers']:
+                if name == b'content-length':
+                    if value.isdigit() and int(value) > self.max_body:
+                        response = Response(
+                            orjson.dumps({'detail': 'Upload too large'}),
+                            status_code=413,
+                            media_type="application/json"
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the cross-session batch scheduler for the lifetime of the app"""
+    scheduler.start()
+    yield
+    await scheduler.stop()
+
+
 # Initialize FastAPI app
-app = FastAPI(title="Deepfake Detection API", version="1.0.0")
+app = FastAPI(title="Deepfake Detection API", version="1.0.0", lifespan=lifespan)
 
-# Configure CORS for Chrome extension
+# Pure-ASGI size check; added before CORS so CORS stays outermost and 413s
+# still carry CORS headers
+app.add_middleware(RequestSizeLimitMiddleware, max_body=MAX_REQUEST_BODY)
+
+# Configure CORS for Chrome extension (regex is compiled once by Starlette)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["chrome-extension://*", "http://localhost:*"],
+    allow_origins=[],
+    allow_origin_regex=r"^(chrome-extension://.*|http://localhost(:\d+)?)$",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -41,8 +90,198 @@ app.add_middleware(
 # Global detector instance
 detector = DeepfakeDetector()
 
-# Session management
-active_sessions = {}
+# SIMD-accelerated JPEG decoder (libjpeg-turbo)
+try:
+    jpeg = TurboJPEG()
+except (OSError, RuntimeError) as e:
+    logger.warning(f"libjpeg-turbo unavailable, falling back to OpenCV decode: {e}")
+    jpeg = None
+
+# Dedicated worker pools: parallel CPU decode, one inference thread so the
+# CUDA context stays on a single thread (batching provides the parallelism)
+DECODE_POOL = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1),
+    thread_name_prefix='decode'
+)
+INFER_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix='infer')
+
+# Detector input size; WebSocket frames are letterboxed to exactly this shape
+TARGET_HW = (224, 224)
+
+# nvJPEG decode straight into GPU memory when the detector accepts CUDA tensors
+USE_GPU_DECODE = torch.cuda.is_available() and hasattr(detector, 'detect_frame_tensor')
+if USE_GPU_DECODE:
+    from torchvision.io import decode_jpeg, ImageReadMode
+
+# nvJPEG decode shares the inference thread so CUDA work stays on one thread
+FRAME_DECODE_POOL = INFER_POOL if USE_GPU_DECODE else DECODE_POOL
+
+
+def jpeg_scaling_factor(width: int, height: int, target_hw):
+    """Largest libjpeg-turbo IDCT scaling that keeps the frame at least target_hw"""
+    target_h, target_w = target_hw
+    for num, denom in ((1, 8), (1, 4), (1, 2)):
+        if width * num // denom >= target_w and height * num // denom >= target_h:
+            return (num, denom)
+    return None
+
+
+def letterbox_frame(frame: np.ndarray, target_hw):
+    """Letterbox a frame to exactly target_hw; returns (padded, unpadded content)"""
+    target_h, target_w = target_hw
+    height, width = frame.shape[:2]
+    if (height, width) == (target_h, target_w):
+        return frame, frame
+    
+    scale = min(target_h / height, target_w / width)
+    new_w = max(1, round(width * scale))
+    new_h = max(1, round(height * scale))
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    resized = cv2.resize(frame, (new_w, new_h), interpolation=interpolation)
+    
+    top = (target_h - new_h) // 2
+    left = (target_w - new_w) // 2
+    padded = cv2.copyMakeBorder(
+        resized, top, target_h - new_h - top, left, target_w - new_w - left,
+        cv2.BORDER_CONSTANT, value=(0, 0, 0)
+    )
+    return padded, resized
+
+
+def decode_image(contents: bytes, target_hw=None):
+    """Decode an encoded image to a BGR frame, or None if undecodable"""
+    frame = None
+    if jpeg is not None:
+        try:
+            # With target_hw, let libjpeg-turbo shrink the image during IDCT
+            # (callers letterbox to the exact size)
+            scaling_factor = None
+            if target_hw is not None:
+                width, height, _, _ = jpeg.decode_header(contents)
+                scaling_factor = jpeg_scaling_factor(width, height, target_hw)
+            frame = jpeg.decode(
+                contents,
+                pixel_format=TJPF_BGR,
+                scaling_factor=scaling_factor,
+                flags=TJFLAG_FASTDCT | TJFLAG_FASTUPSAMPLE
+            )
+        except (OSError, ValueError):
+            # Not a JPEG (e.g. PNG upload), let OpenCV handle it
+            pass
+    
+    if frame is None:
+        nparr = np.frombuffer(contents, np.uint8)
+        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    return frame
+
+
+def decode_frame_gpu(contents: bytes) -> torch.Tensor:
+    """Decode JPEG bytes to a CUDA RGB tensor (C, H, W) without a host copy"""
+    data = torch.frombuffer(contents, dtype=torch.uint8)
+    return decode_jpeg(data, mode=ImageReadMode.RGB, device='cuda')
+
+
+def decode_frame(contents: bytes, target_hw=None):
+    """Decode a frame on the GPU when possible, otherwise on the CPU"""
+    if USE_GPU_DECODE:
+        try:
+            return decode_frame_gpu(contents)
+        except RuntimeError:
+            # nvJPEG rejects non-JPEG payloads
+            pass
+    return decode_image(contents, target_hw)
+
+
+def frame_dhash(frame: np.ndarray) -> int:
+    """64-bit difference hash of a BGR frame"""
+    small = cv2.resize(frame, (9, 8), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    bits = np.packbits(gray[:, 1:] > gray[:, :-1])
+    return int.from_bytes(bits.tobytes(), 'big')
+
+
+def decode_and_hash(contents: bytes):
+    """Decode and letterbox a frame, hashing its unpadded content (CPU frames only)"""
+    frame = decode_frame(contents, TARGET_HW)
+    if isinstance(frame, np.ndarray):
+        # Hash before padding so black bars do not pin hash bits to zero
+        frame, content = letterbox_frame(frame, TARGET_HW)
+        return frame, frame_dhash(content)
+    return frame, None
+
+
+def run_detector(frame) -> Dict:
+    """Dispatch a decoded frame to the matching detector entry point"""
+    if isinstance(frame, torch.Tensor):
+        return detector.detect_frame_tensor(frame)
+    return detector.detect_frame(frame)
+
+
+def run_detector_batch(frames: List) -> List[Dict]:
+    """Run one batched forward pass when possible, else detect frame by frame"""
+    if (
+        hasattr(detector, 'detect_batch')
+        and all(isinstance(f, np.ndarray) for f in frames)
+        and len({f.shape for f in frames}) == 1
+    ):
+        return detector.detect_batch(np.stack(frames))
+    return [run_detector(f) for f in frames]
+
+
+# WebSocket binary message types (first byte of each message)
+MSG_FRAME = 0
+MSG_AUDIO = 1
+MSG_END_SESSION = 2
+
+# Once a result is pending, wait this long for more to share its message
+RESPONSE_FLUSH_INTERVAL = 0.033
+
+# Bounded stage queues; when full the oldest frame is dropped to stay real-time
+DECODE_QUEUE_SIZE = 4
+INFER_QUEUE_SIZE = 4
+
+# Frames within this Hamming distance of the last analysed frame reuse its result
+DUPLICATE_HASH_DISTANCE = 4
+
+# Overall confidence is the deepfake share of the last second at 30fps
+CONFIDENCE_WINDOW = 30
+
+# Finished sessions are kept as compact summaries, least recently used evicted
+SESSION_HISTORY_SIZE = 1024
+
+# Cross-session micro-batching for the detector
+MAX_BATCH = 16
+MAX_WAIT_MS = 8
+
+
+@dataclass(slots=True)
+class Alert:
+    """Session-level alert sent to the client"""
+    timestamp: str
+    type: str
+    confidence: float
+    frame_count: int
+
+
+@dataclass(slots=True)
+class SessionSummary:
+    """Compact record of a finished session"""
+    session_id: str
+    duration: float
+    frame_count: int
+    overall_confidence: float
+    alerts: List[Alert]
+    
+    def get_summary(self) -> Dict:
+        """Get session summary in the same shape as a live session"""
+        return {
+            'session_id': self.session_id,
+            'duration': self.duration,
+            'frame_count': self.frame_count,
+            'overall_confidence': self.overall_confidence,
+            'alerts': self.alerts,
+            'is_active': False
+        }
 
 
 class DetectionSession:
@@ -50,43 +289,415 @@ class DetectionSession:
     
     def __init__(self, session_id: str):
         self.session_id = session_id
-        self.start_time = datetime.now()
+        self.start_time = time.monotonic()
         self.frame_count = 0
-        self.detection_results = deque(maxlen=300)  # 10 seconds at 30fps
+        self._window = deque(maxlen=CONFIDENCE_WINDOW)  # recent is_deepfake flags
+        self._recent_deepfakes = 0
         self.alerts = []
         self.overall_confidence = 0.0
         self.is_active = True
+        self.last_hash = None
+        self.last_result = None
     
     def add_result(self, result: Dict):
         """Add detection result and update session metrics"""
         self.frame_count += 1
-        self.detection_results.append(result)
+        
+        # Rolling count of deepfake frames in the window
+        is_deepfake = int(bool(result['is_deepfake']))
+        if len(self._window) == self._window.maxlen:
+            self._recent_deepfakes -= self._window[0]
+        self._window.append(is_deepfake)
+        self._recent_deepfakes += is_deepfake
         
         # Update overall confidence
-        if len(self.detection_results) > 30:  # Need at least 1 second
-            recent_results = list(self.detection_results)[-30:]
-            deepfake_count = sum(1 for r in recent_results if r['is_deepfake'])
-            self.overall_confidence = deepfake_count / len(recent_results)
+        if self.frame_count > CONFIDENCE_WINDOW:  # Need at least 1 second
+            self.overall_confidence = self._recent_deepfakes / CONFIDENCE_WINDOW
             
             # Generate alert if sustained detection
             if self.overall_confidence > 0.7 and not self.alerts:
-                self.alerts.append({
-                    'timestamp': datetime.now().isoformat(),
-                    'type': 'sustained_deepfake_detection',
-                    'confidence': self.overall_confidence,
-                    'frame_count': self.frame_count
-                })
+                self.alerts.append(Alert(
+                    timestamp=datetime.now().isoformat(),
+                    type='sustained_deepfake_detection',
+                    confidence=self.overall_confidence,
+                    frame_count=self.frame_count
+                ))
     
     def get_summary(self) -> Dict:
         """Get session summary"""
         return {
             'session_id': self.session_id,
-            'duration': (datetime.now() - self.start_time).total_seconds(),
+            'duration': time.monotonic() - self.start_time,
             'frame_count': self.frame_count,
             'overall_confidence': self.overall_confidence,
             'alerts': self.alerts,
             'is_active': self.is_active
         }
+    
+    def to_summary(self) -> SessionSummary:
+        """Freeze the session into a compact summary"""
+        return SessionSummary(
+            session_id=self.session_id,
+            duration=time.monotonic() - self.start_time,
+            frame_count=self.frame_count,
+            overall_confidence=self.overall_confidence,
+            alerts=self.alerts
+        )
+
+
+class SessionRegistry:
+    """Sessions by id, with per-session stats packed into numpy arrays"""
+    
+    def __init__(self, capacity: int = 64):
+        self.sessions = {}
+        self.indices = {}
+        self.slot_ids = []
+        self.frame_counts = np.zeros(capacity, dtype=np.int64)
+        self.confidences = np.zeros(capacity, dtype=np.float64)
+    
+    def __len__(self) -> int:
+        return len(self.sessions)
+    
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.sessions
+    
+    def __getitem__(self, session_id: str) -> DetectionSession:
+        return self.sessions[session_id]
+    
+    def add(self, session: DetectionSession):
+        """Register a session, reusing the slot of a previous session with the same id"""
+        index = self.indices.get(session.session_id)
+        if index is None:
+            index = len(self.sessions)
+            if index == self.frame_counts.size:
+                self._grow()
+            self.indices[session.session_id] = index
+            self.slot_ids.append(session.session_id)
+        
+        self.sessions[session.session_id] = session
+        self.update(session)
+    
+    def update(self, session: DetectionSession):
+        """Copy a session's current stats into its array slot"""
+        # Ignore a stale session that has been replaced under the same id
+        if self.sessions.get(session.session_id) is not session:
+            return
+        
+        index = self.indices[session.session_id]
+        self.frame_counts[index] = session.frame_count
+        self.confidences[index] = session.overall_confidence
+    
+    def remove(self, session: DetectionSession) -> bool:
+        """Unregister a session (last slot moves into its place); False if already replaced"""
+        if self.sessions.get(session.session_id) is not session:
+            return False
+        
+        del self.sessions[session.session_id]
+        index = self.indices.pop(session.session_id)
+        last = len(self.sessions)
+        last_id = self.slot_ids.pop()
+        
+        if index != last:
+            self.slot_ids[index] = last_id
+            self.indices[last_id] = index
+            for array in (self.frame_counts, self.confidences):
+                array[index] = array[last]
+        return True
+    
+    def _grow(self):
+        capacity = self.frame_counts.size * 2
+        for name in ('frame_counts', 'confidences'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:old.size] = old
+            setattr(self, name, new)
+
+
+class SessionHistory:
+    """LRU of finished session summaries with lifetime totals for /stats"""
+    
+    def __init__(self, maxlen: int = SESSION_HISTORY_SIZE):
+        self.maxlen = maxlen
+        self.summaries = OrderedDict()
+        # Lifetime counters; eviction from the LRU does not touch them
+        self.total_sessions = 0
+        self.total_frames = 0
+        self.high_confidence = 0
+    
+    def __len__(self) -> int:
+        return len(self.summaries)
+    
+    def get(self, session_id: str):
+        """Look up a summary, marking it as recently used"""
+        summary = self.summaries.get(session_id)
+        if summary is not None:
+            self.summaries.move_to_end(session_id)
+        return summary
+    
+    def add(self, summary: SessionSummary):
+        """Store a summary, evicting the least recently used beyond maxlen"""
+        self.summaries.pop(summary.session_id, None)
+        self.summaries[summary.session_id] = summary
+        self.total_sessions += 1
+        self.total_frames += summary.frame_count
+        self.high_confidence += summary.overall_confidence > 0.7
+        
+        while len(self.summaries) > self.maxlen:
+            self.summaries.popitem(last=False)
+
+
+# Session management
+active_sessions = SessionRegistry()
+completed_sessions = SessionHistory()
+
+
+class ResponseBatcher:
+    """Coalesces detection results and alerts into one WebSocket message per flush"""
+    
+    def __init__(self, websocket: WebSocket, session: DetectionSession):
+        self.websocket = websocket
+        self.session = session
+        self.pending = deque()
+        self.alerts_sent = 0
+        self.closing = False
+        self.ready = asyncio.Event()
+        self.task = None
+    
+    def start(self):
+        """Spawn the flush task"""
+        self.task = asyncio.create_task(self.run())
+    
+    async def close(self):
+        """Let the flush task finish its current send, then flush what is left"""
+        self.closing = True
+        self.ready.set()
+        await self.task
+        await self.flush()
+    
+    def add(self, result: Dict):
+        """Queue a detection result for the next flush"""
+        self.pending.append(result)
+        self.ready.set()
+    
+    async def flush(self):
+        """Send queued results and any new alerts as a single batch message"""
+        new_alerts = self.session.alerts[self.alerts_sent:]
+        if not self.pending and not new_alerts:
+            return
+        
+        results = [self.pending.popleft() for _ in range(len(self.pending))]
+        self.alerts_sent += len(new_alerts)
+        
+        batch = {
+            'type': 'batch',
+            'results': results,
+            'alerts': new_alerts,
+            'session_summary': self.session.get_summary()
+        }
+        await self.websocket.send_bytes(
+            orjson.dumps(batch, option=orjson.OPT_SERIALIZE_NUMPY)
+        )
+    
+    async def run(self):
+        """Flush whenever results are pending, until closed or the client goes away"""
+        while True:
+            await self.ready.wait()
+            if self.closing:
+                return
+            
+            # Give results arriving right behind this one a chance to join it
+            await asyncio.sleep(RESPONSE_FLUSH_INTERVAL)
+            self.ready.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Result flush failed, stopping: {e}")
+                return
+
+
+class BatchScheduler:
+    """Gathers frames from all sessions into batched detector calls"""
+    
+    def __init__(self, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = None
+        self.task = None
+        self.loop = None
+    
+    def start(self):
+        """Start the batching task on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # Queues are bound to the loop that first uses them
+            self.queue = asyncio.Queue()
+            self.loop = loop
+        self.task = loop.create_task(self._run())
+    
+    async def stop(self):
+        """Cancel the batching task"""
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+    
+    def submit(self, frame) -> asyncio.Future:
+        """Queue a decoded frame; the returned future resolves to its result"""
+        loop = asyncio.get_running_loop()
+        # Restart if the lifespan did not run, the task died, or the loop changed
+        if self.task is None or self.task.done() or self.loop is not loop:
+            self.start()
+        
+        future = loop.create_future()
+        self.queue.put_nowait((frame, future))
+        return future
+    
+    async def _collect(self) -> List:
+        """Wait for one frame, then take more until the batch is full or time is up"""
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        while len(batch) < self.max_batch and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        
+        # Only hold frames back when another session could join the batch
+        if not hasattr(detector, 'detect_batch') or len(active_sessions) <= 1:
+            return batch
+        
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            frames = [frame for frame, _ in batch]
+            
+            try:
+                results = await loop.run_in_executor(INFER_POOL, run_detector_batch, frames)
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"Detector returned {len(results)} results for {len(batch)} frames"
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(batch, results):
+                # Sessions that disconnected have already cancelled their future
+                if not future.done():
+                    future.set_result(result)
+
+
+scheduler = BatchScheduler()
+
+
+def offer_latest(queue: asyncio.Queue, item):
+    """Enqueue without blocking, dropping the oldest item if the queue is full"""
+    if queue.full():
+        queue.get_nowait()
+        queue.task_done()
+    queue.put_nowait(item)
+
+
+class FramePipeline:
+    """Runs decode and inference as separate stages off the WebSocket receive loop"""
+    
+    def __init__(self, session: DetectionSession, batcher: ResponseBatcher):
+        self.session = session
+        self.batcher = batcher
+        self.decode_queue = asyncio.Queue(maxsize=DECODE_QUEUE_SIZE)
+        self.infer_queue = asyncio.Queue(maxsize=INFER_QUEUE_SIZE)
+        self.tasks = []
+    
+    def start(self):
+        """Spawn the decode and inference workers"""
+        self.tasks = [
+            asyncio.create_task(self._decode_worker()),
+            asyncio.create_task(self._infer_worker())
+        ]
+    
+    def submit(self, payload):
+        """Hand an encoded frame to the pipeline"""
+        offer_latest(self.decode_queue, payload)
+    
+    async def drain(self):
+        """Wait until every queued frame has been processed"""
+        await self.decode_queue.join()
+        await self.infer_queue.join()
+    
+    def stop(self):
+        """Cancel the workers"""
+        for task in self.tasks:
+            task.cancel()
+    
+    def _reuse_result(self, frame_hash):
+        """Return the last result if this frame is a near-duplicate of the last analysed one"""
+        last_hash = self.session.last_hash
+        if frame_hash is None or last_hash is None:
+            return None
+        if (frame_hash ^ last_hash).bit_count() > DUPLICATE_HASH_DISTANCE:
+            return None
+        return self.session.last_result
+    
+    async def _decode_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            payload = await self.decode_queue.get()
+            try:
+                frame, frame_hash = await loop.run_in_executor(
+                    FRAME_DECODE_POOL, decode_and_hash, payload
+                )
+                if frame is not None:
+                    offer_latest(self.infer_queue, (frame, frame_hash))
+            except Exception as e:
+                logger.error(f"Frame decode error: {e}")
+            finally:
+                self.decode_queue.task_done()
+    
+    async def _infer_worker(self):
+        while True:
+            frame, frame_hash = await self.infer_queue.get()
+            try:
+                result = self._reuse_result(frame_hash)
+                if result is None:
+                    result = await scheduler.submit(frame)
+                    self.session.last_hash = frame_hash
+                    self.session.last_result = result
+                
+                self.session.add_result(result)
+                active_sessions.update(self.session)
+                
+                # Queue result for the next batched send
+                self.batcher.add(result)
+            except Exception as e:
+                logger.error(f"Frame detection error: {e}")
+            finally:
+                self.infer_queue.task_done()
+
+
+async def read_upload(file: UploadFile) -> memoryview:
+    """Read an upload, rejecting files over MAX_UPLOAD (backstop for chunked bodies)"""
+    if file.size is not None and file.size > MAX_UPLOAD:
+        raise HTTPException(status_code=413, detail="Upload too large")
+    
+    buffer = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK):
+        buffer.extend(chunk)
+        if len(buffer) > MAX_UPLOAD:
+            raise HTTPException(status_code=413, detail="Upload too large")
+    
+    return memoryview(buffer)
 
 
 @app.get("/")
@@ -95,7 +706,8 @@ async def root():
     return {
         "status": "online",
         "detector": "ready",
-        "gpu_available": torch.cuda.is_available()
+        "gpu_available": torch.cuda.is_available(),
+        "gpu_decode": USE_GPU_DECODE
     }
 
 
@@ -104,18 +716,23 @@ async def detect_frame(file: UploadFile = File(...)):
     """Analyze single frame for deepfake detection"""
     try:
         # Read image
-        contents = await file.read()
-        nparr = np.frombuffer(contents, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        contents = await read_upload(file)
+        loop = asyncio.get_running_loop()
+        frame = await loop.run_in_executor(FRAME_DECODE_POOL, decode_frame, contents)
         
         if frame is None:
             raise HTTPException(status_code=400, detail="Invalid image")
         
         # Detect
-        result = detector.detect_frame(frame)
+        result = await loop.run_in_executor(INFER_POOL, run_detector, frame)
         
-        return JSONResponse(content=result)
+        return Response(
+            orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY),
+            media_type="application/json"
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Frame detection error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -128,61 +745,81 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
     
     # Create new session
     session = DetectionSession(session_id)
-    active_sessions[session_id] = session
+    active_sessions.add(session)
+    
+    # Batch outgoing results instead of one send per frame
+    batcher = ResponseBatcher(websocket, session)
+    batcher.start()
+    
+    # Decode and inference run concurrently with receiving
+    pipeline = FramePipeline(session, batcher)
+    pipeline.start()
     
     try:
         while True:
-            # Receive frame data
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            # Receive binary message: 1 type byte + raw payload
+            received = await websocket.receive()
+            if received['type'] == 'websocket.disconnect':
+                break
             
-            if message['type'] == 'frame':
-                # Decode base64 frame
-                frame_data = base64.b64decode(message['data'])
-                nparr = np.frombuffer(frame_data, np.uint8)
-                frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                
-                if frame is not None:
-                    # Detect deepfake
-                    result = detector.detect_frame(frame)
-                    session.add_result(result)
-                    
-                    # Send result back
-                    await websocket.send_json({
-                        'type': 'detection_result',
-                        'result': result,
-                        'session_summary': session.get_summary()
-                    })
-                    
-                    # Send alert if needed
-                    if session.alerts and len(session.alerts) > 0:
-                        await websocket.send_json({
-                            'type': 'alert',
-                            'alert': session.alerts[-1]
-                        })
+            message = received.get('bytes')
+            if message is None:
+                # Text frames come from extension builds that predate the binary protocol
+                logger.warning(f"Session {session_id} sent a text frame; closing (binary protocol required)")
+                await websocket.close(code=1003, reason="Binary frames required")
+                break
+            if not message:
+                continue
+            msg_type = message[0]
+            payload = memoryview(message)[1:]
+            
+            if msg_type == MSG_FRAME:
+                # Payload is the raw JPEG frame
+                pipeline.submit(payload)
             
-            elif message['type'] == 'audio':
+            elif msg_type == MSG_AUDIO:
                 # Handle audio data for lip-sync detection
                 # This would be integrated with frame detection
                 pass
             
-            elif message['type'] == 'end_session':
+            elif msg_type == MSG_END_SESSION:
+                # Finish in-flight frames, then stop the flusher
+                # and send whatever is left
+                await pipeline.drain()
+                await batcher.close()
                 break
                 
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
+        pipeline.stop()
+        batcher.task.cancel()
         session.is_active = False
-        await websocket.close()
+        
+        # Free the live session, keep only a compact summary
+        # (skipped if a reconnect under the same id has replaced this session)
+        if active_sessions.remove(session):
+            completed_sessions.add(session.to_summary())
+        
+        # Close unless the client already left or we closed with a reason above
+        if (
+            websocket.client_state == WebSocketState.CONNECTED
+            and websocket.application_state == WebSocketState.CONNECTED
+        ):
+            await websocket.close()
 
 
 @app.get("/session/{session_id}")
 async def get_session(session_id: str):
     """Get session details"""
-    if session_id not in active_sessions:
+    if session_id in active_sessions:
+        return active_sessions[session_id].get_summary()
+    
+    summary = completed_sessions.get(session_id)
+    if summary is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return active_sessions[session_id].get_summary()
+    return summary.get_summary()
 
 
 @app.post("/train/feedback")
@@ -209,16 +846,17 @@ async def submit_feedback(
 @app.get("/stats")
 async def get_statistics():
     """Get detection statistics"""
-    total_sessions = len(active_sessions)
-    active_count = sum(1 for s in active_sessions.values() if s.is_active)
+    live_sessions = len(active_sessions)
+    frame_counts = active_sessions.frame_counts[:live_sessions]
+    confidences = active_sessions.confidences[:live_sessions]
     
+    # Finished sessions contribute through the history's lifetime totals
     detection_stats = {
-        'total_sessions': total_sessions,
-        'active_sessions': active_count,
-        'total_frames_processed': sum(s.frame_count for s in active_sessions.values()),
-        'high_confidence_detections': sum(
-            1 for s in active_sessions.values() 
-            if s.overall_confidence > 0.7
+        'total_sessions': live_sessions + completed_sessions.total_sessions,
+        'active_sessions': live_sessions,
+        'total_frames_processed': int(frame_counts.sum()) + completed_sessions.total_frames,
+        'high_confidence_detections': (
+            int(np.count_nonzero(confidences > 0.7)) + completed_sessions.high_confidence
         )
     }
     
@@ -230,12 +868,14 @@ async def calibrate_user(user_id: str, file: UploadFile = File(...)):
     """Calibrate detector for specific user (reduce false positives)"""
     try:
         # Read calibration video/image
-        contents = await file.read()
-        nparr = np.frombuffer(contents, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        contents = await read_upload(file)
+        loop = asyncio.get_running_loop()
+        frame = await loop.run_in_executor(DECODE_POOL, decode_image, contents)
         
         # Extract user-specific features for baseline
-        landmarks = detector._extract_landmarks(frame)
+        landmarks = await loop.run_in_executor(
+            INFER_POOL, detector._extract_landmarks, frame
+        )
         
         if landmarks is not None:
             # Store user baseline (in production, use database)
@@ -250,10 +890,21 @@ async def calibrate_user(user_id: str, file: UploadFile = File(...)):
         else:
             raise HTTPException(status_code=400, detail="No face detected")
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Calibration error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvloop/httptools come with uvicorn[standard]. Sessions live in process
+    # memory, so stay on a single worker.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets"
+    )
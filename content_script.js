@@ -3,6 +3,11 @@
  * Captures video frames and sends to Python backend for analysis
  */
 
+// WebSocket binary message types (first byte of each message)
+const MSG_FRAME = 0;
+const MSG_AUDIO = 1;
+const MSG_END_SESSION = 2;
+
 class IntegrityGuard {
     constructor() {
       this.ws = null;
@@ -12,10 +17,12 @@ class IntegrityGuard {
       this.videoElement = null;
       this.canvas = null;
       this.ctx = null;
+      this.textDecoder = new TextDecoder();
       
       // Detection settings
       this.config = {
         frameRate: 5, // Capture 5 frames per second
+        jpegQuality: 0.8,
         websocketUrl: 'ws://localhost:8000/ws/detect/',
         apiUrl: 'http://localhost:8000',
         enableOverlayDetection: true,
@@ -163,13 +170,18 @@ class IntegrityGuard {
     async connectWebSocket() {
       try {
         this.ws = new WebSocket(this.config.websocketUrl + this.sessionId);
+        this.ws.binaryType = 'arraybuffer';
         
         this.ws.onopen = () => {
           console.log('[Integrity Guard] Connected to backend');
         };
         
         this.ws.onmessage = (event) => {
-          const data = JSON.parse(event.data);
+          // Server sends UTF-8 JSON as binary frames
+          const text = typeof event.data === 'string'
+            ? event.data
+            : this.textDecoder.decode(event.data);
+          const data = JSON.parse(text);
           this.handleDetectionResult(data);
         };
         
@@ -221,7 +233,7 @@ class IntegrityGuard {
       
       // Send end session message
       if (this.ws && this.ws.readyState === WebSocket.OPEN) {
-        this.ws.send(JSON.stringify({ type: 'end_session' }));
+        this.ws.send(new Uint8Array([MSG_END_SESSION]));
       }
       
       console.log('[Integrity Guard] Stopped capture');
@@ -241,18 +253,12 @@ class IntegrityGuard {
         // Draw current frame
         this.ctx.drawImage(this.videoElement, 0, 0);
         
-        // Convert to base64
-        const frameData = this.canvas.toDataURL('image/jpeg', 0.8);
-        const base64Data = frameData.split(',')[1];
-        
-        // Send to backend if connected
-        if (this.ws && this.ws.readyState === WebSocket.OPEN) {
-          this.ws.send(JSON.stringify({
-            type: 'frame',
-            data: base64Data,
-            timestamp: Date.now()
-          }));
-        }
+        // Encode as JPEG and send as a binary message (type byte + raw bytes)
+        this.canvas.toBlob((blob) => {
+          if (blob && this.ws && this.ws.readyState === WebSocket.OPEN) {
+            this.ws.send(new Blob([new Uint8Array([MSG_FRAME]), blob]));
+          }
+        }, 'image/jpeg', this.config.jpegQuality);
         
         // Also check for overlays
         if (this.config.enableOverlayDetection) {
@@ -271,7 +277,14 @@ class IntegrityGuard {
      * Handle detection result from backend
      */
     handleDetectionResult(data) {
-      if (data.type === 'detection_result') {
+      if (data.type === 'batch') {
+        // Server coalesces results and alerts into one message per flush
+        data.results.forEach(result => {
+          this.handleDetectionResult({ type: 'detection_result', result: result });
+        });
+        data.alerts.forEach(alert => this.handleAlert(alert));
+        
+      } else if (data.type === 'detection_result') {
         const result = data.result;
         this.results.deepfakes.push(result);
         